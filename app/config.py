@@ -1,125 +1,175 @@
 import logging
-from typing import List
+import os
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Final, Mapping, Optional, Tuple
+
+from pydantic import field_validator
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+
+
+# Leave logging alone if the host (uvicorn, pytest, a script) already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+# Static app metadata; not configurable through the environment
+APP_TITLE: Final[str] = "Plant Care API"
+APP_DESCRIPTION: Final[str] = (
+    "Smart plant care instructions with automatic plant care category classification and AI-powered plant identification from images. "
+    "Houseplants get focused care guidance (no seed starting), while outdoor plants receive complete zone-specific instructions including seed starting and planting. "
+    "Features include: plant identification from uploaded photos, personalized care instructions, and USDA zone-specific guidance. "
+    "Perfect for apartment dwellers and gardeners."
+)
+APP_VERSION: Final[str] = "1.7.0"
 
+# Production containers get their config from the orchestrator; only read .env elsewhere
+_ENV_FILE = None if os.environ.get("APP_ENV", "development").lower() == "production" else ".env"
+
+# CORS origins; the same set is allowed in every environment
+CORS_ORIGINS: Final[Tuple[str, ...]] = (
+    "https://gardengenie.lovable.app",  # Production frontend
+    "https://www.garden-genie.com",     # Production domain (www)
+    "https://garden-genie.com",         # Production domain (no www)
+    "https://gardengenie.vercel.app",   # Vercel deployment
+    "http://localhost",                 # Local development
+    "http://localhost:8000",           # Local backend
+    "http://localhost:3000",           # Local frontend (common React port)
+    "http://127.0.0.1:8000",          # Alternative localhost
+    "http://127.0.0.1:3000",          # Alternative localhost
+)
+
+
+# Parsed .env contents keyed by (path, mtime); reparsed only when the file changes
+_DOTENV_CACHE: Dict[Tuple[str, int], Mapping[str, Optional[str]]] = {}
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+
+class _CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    def _read_env_file(self, file_path: Path) -> Mapping[str, Optional[str]]:
+        key = (str(file_path), file_path.stat().st_mtime_ns)
+        env_vars = _DOTENV_CACHE.get(key)
+        if env_vars is None:
+            env_vars = _DOTENV_CACHE[key] = super()._read_env_file(file_path)
+        return env_vars
+
+
+class AppEnv(str, Enum):
+    development = "development"
+    production = "production"
 
 
 class Settings(BaseSettings):
     # App
-    app_env: str = "development"
-    app_title: str = "Plant Care API"
-    app_description: str = (
-        "Smart plant care instructions with automatic plant care category classification and AI-powered plant identification from images. "
-        "Houseplants get focused care guidance (no seed starting), while outdoor plants receive complete zone-specific instructions including seed starting and planting. "
-        "Features include: plant identification from uploaded photos, personalized care instructions, and USDA zone-specific guidance. "
-        "Perfect for apartment dwellers and gardeners."
-    )
-    app_version: str = "1.7.0"
+    app_env: AppEnv = AppEnv.development
 
     # Upload limits
     max_upload_mb: int = 10
 
     # Supabase
-    supabase_url: str | None = None
-    supabase_key: str | None = None
+    supabase_url: str = ""
+    supabase_key: str = ""
 
     # OpenRouter / LLM
-    openrouter_api_key: str | None = None
+    openrouter_api_key: str = ""
     llm_model: str = "openai/gpt-5-mini"
     llm_timeout_seconds: int = 30
     llm_max_retries: int = 3
     llm_use_structured_outputs: bool = True
+    # Exact-match response cache; 0 disables it
+    llm_cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    llm_cache_max_entries: int = 1024
+    # Also store the full raw LLM text with each plant row; for debugging only
+    debug_persist_raw_llm: bool = False
     # Vision
     vision_llm_model: str = "google/gemini-2.5-flash"
 
     # Unsplash
-    unsplash_access_key: str | None = None
+    unsplash_access_key: str = ""
     unsplash_api_url: str = "https://api.unsplash.com/search/photos"
     unsplash_timeout_seconds: int = 7
     unsplash_max_retries: int = 3
 
     model_config = SettingsConfigDict(
-        env_file=".env",
+        # .env is read by _CachedDotEnvSettingsSource (see settings_customise_sources)
+        env_file=None,
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        defer_build=True,
+        frozen=True,
     )
 
-    @property
-    def cors_origins(self) -> List[str]:
-        """
-        Return CORS origins based on environment.
-        In production, prioritize production URLs but also allow localhost for testing.
-        In development, allow both localhost and production URLs for flexibility.
-        """
-        env = (self.app_env or "development").lower()
-        
-        # Base origins that are always allowed
-        base_origins = [
-            "https://gardengenie.lovable.app",  # Production frontend
-            "https://www.garden-genie.com",     # Production domain (www)
-            "https://garden-genie.com",         # Production domain (no www)
-            "https://gardengenie.vercel.app",   # Vercel deployment
-            "http://localhost",                 # Local development
-            "http://localhost:8000",           # Local backend
-            "http://localhost:3000",           # Local frontend (common React port)
-            "http://127.0.0.1:8000",          # Alternative localhost
-            "http://127.0.0.1:3000",          # Alternative localhost
-        ]
-        
-        if env == "production":
-            logger.info("CORS configured for production environment")
-            return base_origins
-        else:
-            logger.info("CORS configured for development environment")
-            return base_origins
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,
+            env_settings,
+            _CachedDotEnvSettingsSource(settings_cls, env_file=_ENV_FILE),
+            file_secret_settings,
+        )
+
+    @field_validator("app_env", mode="before")
+    @classmethod
+    def _normalize_app_env(cls, value: Any) -> Any:
+        return value.lower() if isinstance(value, str) else value
 
 
 def _validate_on_startup(settings: Settings) -> None:
-    fatal_errors: List[str] = []
-
     if not settings.supabase_url or not settings.supabase_key:
-        fatal_errors.append("Supabase URL or Key is missing")
+        if settings.app_env is AppEnv.production:
+            # In production, fail fast on critical missing config
+            raise RuntimeError("Supabase URL or Key is missing")
         logger.error("Supabase URL or Key not found in environment variables. Database operations will fail.")
 
-    if not settings.openrouter_api_key:
-        logger.warning("OPENROUTER_API_KEY not found in environment variables.")
-
-    if not settings.unsplash_access_key:
-        logger.warning("UNSPLASH_ACCESS_KEY not found in environment variables. Image fetching will be skipped.")
-
-    if settings.app_env.lower() == "production" and fatal_errors:
-        # In production, fail fast on critical missing config
-        raise RuntimeError("; ".join(fatal_errors))
-
-
-# Instantiate settings once and expose backwards-compatible constants
-settings = Settings()
-_validate_on_startup(settings)
-
-# Back-compat module-level constants for existing imports
-APP_ENV = settings.app_env
-APP_TITLE = settings.app_title
-APP_DESCRIPTION = settings.app_description
-APP_VERSION = settings.app_version
-CORS_ORIGINS = settings.cors_origins
-MAX_UPLOAD_MB = settings.max_upload_mb
-
-SUPABASE_URL = settings.supabase_url
-SUPABASE_KEY = settings.supabase_key
-
-OPENROUTER_API_KEY = settings.openrouter_api_key
-LLM_MODEL = settings.llm_model
-LLM_TIMEOUT_SECONDS = settings.llm_timeout_seconds
-LLM_MAX_RETRIES = settings.llm_max_retries
-USE_STRUCTURED_OUTPUTS = settings.llm_use_structured_outputs
-VISION_LLM_MODEL = settings.vision_llm_model
-
-UNSPLASH_ACCESS_KEY = settings.unsplash_access_key
-UNSPLASH_API_URL = settings.unsplash_api_url
-UNSPLASH_TIMEOUT_SECONDS = settings.unsplash_timeout_seconds
-UNSPLASH_MAX_RETRIES = settings.unsplash_max_retries
\ No newline at end of file
+    # OpenRouter and Unsplash keys are optional at startup; their clients
+    # report a missing key when they are first used.
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build and validate settings on first use; later calls return the same instance."""
+    settings = Settings()
+    _validate_on_startup(settings)
+    return settings
+
+
+# Back-compat module-level constants for existing imports, resolved lazily (PEP 562)
+_LEGACY_NAMES = {
+    "APP_ENV": "app_env",
+    "MAX_UPLOAD_MB": "max_upload_mb",
+    "SUPABASE_URL": "supabase_url",
+    "SUPABASE_KEY": "supabase_key",
+    "OPENROUTER_API_KEY": "openrouter_api_key",
+    "LLM_MODEL": "llm_model",
+    "LLM_TIMEOUT_SECONDS": "llm_timeout_seconds",
+    "LLM_MAX_RETRIES": "llm_max_retries",
+    "USE_STRUCTURED_OUTPUTS": "llm_use_structured_outputs",
+    "LLM_CACHE_TTL_SECONDS": "llm_cache_ttl_seconds",
+    "LLM_CACHE_MAX_ENTRIES": "llm_cache_max_entries",
+    "DEBUG_PERSIST_RAW_LLM": "debug_persist_raw_llm",
+    "VISION_LLM_MODEL": "vision_llm_model",
+    "UNSPLASH_ACCESS_KEY": "unsplash_access_key",
+    "UNSPLASH_API_URL": "unsplash_api_url",
+    "UNSPLASH_TIMEOUT_SECONDS": "unsplash_timeout_seconds",
+    "UNSPLASH_MAX_RETRIES": "unsplash_max_retries",
+}
+
+
+def __getattr__(name: str) -> Any:
+    attr = _LEGACY_NAMES.get(name)
+    if attr is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(get_settings(), attr)
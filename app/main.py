@@ -1,5 +1,7 @@
 import os
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, UploadFile, File, BackgroundTasks
 from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,17 +10,33 @@ from starlette.responses import JSONResponse
 
 from .config import APP_TITLE, APP_DESCRIPTION, APP_VERSION, CORS_ORIGINS, MAX_UPLOAD_MB
 from .models import PlantCareInput, PlantIdentificationResponse, PlantCareResponse
-from .services.plant_care.plant_care import generate_plant_care_instructions, fetch_and_store_image_for_plant
+from .services.plant_care.plant_care import (
+    generate_plant_care_instructions,
+    persist_plant_care_instructions,
+    fetch_and_store_image_for_plant,
+)
 from .services.plant_identification.plant_identification import identify_plant_from_uploaded_image, validate_image_data
-from .database.supabase_client import health_check, get_supabase_client
+from .database.supabase_client import health_check, get_supabase_client, close_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# Size of each read from an uploaded image
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
 # --- FastAPI Application Setup ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the Supabase client once at startup rather than at import or on the first request
+    await run_in_threadpool(get_supabase_client)
+    yield
+    # Release its pooled connections on graceful shutdown instead of leaking the sockets
+    await run_in_threadpool(close_supabase_client)
+
 app = FastAPI(
     title=APP_TITLE,
     description=APP_DESCRIPTION,
     version=APP_VERSION,
+    lifespan=lifespan,
 )
 
 # --- CORS Middleware ---
@@ -60,20 +78,36 @@ app.add_middleware(RequestSizeLimitMiddleware, max_upload_mb=MAX_UPLOAD_MB)
 
 # --- API Endpoints ---
 
+async def _store_care_and_image(plant_name: str, user_zone: str, care_info: dict) -> None:
+    """Background task: run the independent care and image writes concurrently in the threadpool."""
+    # Fetch the image using the possibly corrected name
+    corrected_plant_name = care_info.get('plantName', plant_name)
+    results = await asyncio.gather(
+        run_in_threadpool(fetch_and_store_image_for_plant, corrected_plant_name),
+        run_in_threadpool(persist_plant_care_instructions, plant_name, user_zone, care_info),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Background storage error for '%s': %s", plant_name, result)
+
 @app.post("/plant-care-instructions", response_model=PlantCareResponse)
 async def get_plant_care_instructions(payload: PlantCareInput, request: Request, background_tasks: BackgroundTasks):
     """
     Receives a plant name and USDA zone, classifies the plant care category,
-    generates appropriate care instructions using an LLM, stores the result
-    in Supabase, and returns the care instructions as a JSON object.
+    generates appropriate care instructions using an LLM, and returns the care
+    instructions as a JSON object. Storing the result in Supabase and fetching
+    the plant image run as background tasks after the response is sent; set
+    `persist` to false for a preview that skips both (no Unsplash call and no
+    database access).
     """
-    supabase_client = get_supabase_client()
-    if supabase_client is None:
+    # Previews never touch the database, so they do not need the client
+    if payload.persist and get_supabase_client() is None:
         raise HTTPException(status_code=503, detail="Database client is not initialized. Cannot process request.")
 
     plant_name = payload.plant_name
     user_zone = payload.user_zone
-    logger.info(f"Received request for plant care: '{plant_name}' in zone '{user_zone}'")
+    logger.info("Received request for plant care: '%s' in zone '%s'", plant_name, user_zone)
 
     # Generate plant care instructions using the service (offload to threadpool)
     care_info = await run_in_threadpool(
@@ -81,7 +115,7 @@ async def get_plant_care_instructions(payload: PlantCareInput, request: Request,
         plant_name,
         user_zone,
         False,               # skip image handling in-request
-        payload.persist,     # control DB upsert per request; default True
+        False,               # persist in the background below instead
     )
     
     # If the input was determined not to be a plant, return a clear 400
@@ -91,13 +125,14 @@ async def get_plant_care_instructions(payload: PlantCareInput, request: Request,
     if care_info is None:
         raise HTTPException(status_code=503, detail="Error generating plant care instructions.")
 
-    logger.info(f"Successfully generated care instructions for '{plant_name}'")
+    logger.info("Successfully generated care instructions for '%s'", plant_name)
 
-    # Kick off background image fetch/store using possibly corrected name
-    corrected_plant_name = care_info.get('plantName', plant_name)
-    background_tasks.add_task(fetch_and_store_image_for_plant, corrected_plant_name)
+    # Store the result and fetch the image after the response is sent (payload.persist defaults to True)
+    if payload.persist:
+        background_tasks.add_task(_store_care_and_image, plant_name, user_zone, care_info)
 
-    return care_info
+    # "__" keys carry LLM metadata and the plant group for storage only; keep them out of the response
+    return {key: value for key, value in care_info.items() if not key.startswith("__")}
 
 @app.post("/identify-plant", response_model=PlantIdentificationResponse)
 async def identify_plant(file: UploadFile = File(...)):
@@ -105,7 +140,7 @@ async def identify_plant(file: UploadFile = File(...)):
     Accepts an uploaded image and uses AI vision to determine if it contains a plant
     and identify its common name if it is a plant.
     """
-    logger.info(f"Received plant identification request for file: {file.filename}")
+    logger.info("Received plant identification request for file: %s", file.filename)
     
     # Validate file type
     if not file.content_type or not file.content_type.startswith('image/'):
@@ -117,13 +152,16 @@ async def identify_plant(file: UploadFile = File(...)):
     # Read and validate the file
     try:
         max_bytes = MAX_UPLOAD_MB * 1024 * 1024
-        image_data = await file.read(max_bytes + 1)
-
-        if len(image_data) > max_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"Uploaded image too large. Maximum size is {MAX_UPLOAD_MB}MB",
-            )
+        # Read in chunks so an oversized upload is rejected as soon as it crosses the limit
+        buffer = bytearray()
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            buffer.extend(chunk)
+            if len(buffer) > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Uploaded image too large. Maximum size is {MAX_UPLOAD_MB}MB",
+                )
+        image_data = bytes(buffer)
 
         validation_result = validate_image_data(image_data, max_size_mb=MAX_UPLOAD_MB)
         
@@ -133,15 +171,18 @@ async def identify_plant(file: UploadFile = File(...)):
                 detail=validation_result["error"]
             )
             
+    except HTTPException:
+        # Keep the specific 413/400 responses raised above
+        raise
     except Exception as e:
-        logger.error(f"Error reading uploaded file: {e}")
+        logger.error("Error reading uploaded file: %s", e)
         raise HTTPException(
             status_code=400,
             detail="Error reading uploaded image file."
         )
     
-    # Analyze the image
-    identification_result = identify_plant_from_uploaded_image(image_data)
+    # Analyze the image (blocking LLM call; offload to threadpool)
+    identification_result = await run_in_threadpool(identify_plant_from_uploaded_image, image_data)
     
     if identification_result is None:
         raise HTTPException(
@@ -157,13 +198,14 @@ async def identify_plant(file: UploadFile = File(...)):
         message=identification_result.get('message', 'Analysis completed.')
     )
     
-    logger.info(f"Plant identification completed: {response.is_plant}, {response.common_name}")
+    logger.info("Plant identification completed: %s, %s", response.is_plant, response.common_name)
     return response
 
 @app.get("/health", status_code=200)
-async def health_check_endpoint():
-    """Simple health check endpoint. Checks Supabase connection."""
-    return health_check()
+async def health_check_endpoint(force: bool = False):
+    """Simple health check endpoint. Checks Supabase connection; pass ?force=1 to skip the cached result."""
+    # The Supabase client is synchronous; keep the probe off the event loop
+    return await run_in_threadpool(health_check, force)
 
 # --- Local Development Runner ---
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ from typing import Optional, List, Dict, Any, Literal, Union
 class PlantCareInput(BaseModel):
     plant_name: str = Field(..., min_length=1, description="The user-provided plant name (e.g., tomato, Fiddle Leaf Fig).")
     user_zone: str = Field(..., pattern=r"^\d{1,2}[ab]?$", description="The user's USDA Hardiness Zone (e.g., 7a, 8b, 5).")
-    persist: bool = Field(default=True, description="Whether to upsert the generated care into Supabase. Defaults to True.")
+    persist: bool = Field(default=True, description="Whether to upsert the generated care into Supabase and fetch and store the plant image (in the background, after the response). Set to False for previews or load tests; no database access or Unsplash calls are made. Defaults to True.")
 
 
 class PlantIdentificationResponse(BaseModel):
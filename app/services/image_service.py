@@ -1,18 +1,25 @@
 import requests
 import logging
+import time
 from typing import Optional, Dict
 
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from ..config import UNSPLASH_ACCESS_KEY, UNSPLASH_API_URL, UNSPLASH_TIMEOUT_SECONDS, UNSPLASH_MAX_RETRIES
 
 logger = logging.getLogger(__name__)
 
-@retry(
-    reraise=True,
-    stop=stop_after_attempt(UNSPLASH_MAX_RETRIES),
-    wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
-    retry=retry_if_exception_type(requests.exceptions.RequestException),
-)
+# Shared session so repeated Unsplash calls reuse pooled keep-alive connections
+_session = requests.Session()
+
+# Server-side failures worth retrying; a 429 means the hourly quota is spent, so it is not retried
+_RETRYABLE_STATUS_CODES = frozenset((500, 502, 503, 504))
+
+def _is_retryable(error: requests.exceptions.RequestException) -> bool:
+    """Retry connection errors, timeouts and 5xx responses; fail fast on anything else."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return isinstance(error, requests.exceptions.HTTPError) and response is not None and response.status_code in _RETRYABLE_STATUS_CODES
+
 def get_unsplash_image(plant_name: str) -> Optional[dict]:
     """Queries the Unsplash API for an image of the given plant name."""
     if not UNSPLASH_ACCESS_KEY:
@@ -29,14 +36,30 @@ def get_unsplash_image(plant_name: str) -> Optional[dict]:
         "orientation": "landscape"  # Optional: prefer landscape images
     }
 
+    attempts = max(1, UNSPLASH_MAX_RETRIES)
+    for attempt in range(attempts):
+        try:
+            response = _session.get(UNSPLASH_API_URL, headers=headers, params=params, timeout=UNSPLASH_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            break
+        except requests.exceptions.RequestException as e:
+            if attempt < attempts - 1 and _is_retryable(e):
+                delay = min(4.0, 0.5 * 2 ** attempt)
+                logger.warning("Transient Unsplash error for '%s' (attempt %s/%s): %s. Retrying in %ss", plant_name, attempt + 1, attempts, e, delay)
+                time.sleep(delay)
+                continue
+            logger.error("Error calling Unsplash API for '%s': %s", plant_name, e)
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error("Unsplash Response Status: %s", e.response.status_code)
+                logger.error("Unsplash Response Text: %s", e.response.text)
+            return None
+
     try:
-        response = requests.get(UNSPLASH_API_URL, headers=headers, params=params, timeout=UNSPLASH_TIMEOUT_SECONDS)
-        response.raise_for_status()
         data = response.json()
 
         results = data.get("results")
         if not results:
-            logger.info(f"No Unsplash image found for query: '{plant_name}'")
+            logger.info("No Unsplash image found for query: '%s'", plant_name)
             return None
 
         first_image = results[0]
@@ -45,25 +68,19 @@ def get_unsplash_image(plant_name: str) -> Optional[dict]:
         photographer_url = first_image.get("user", {}).get("links", {}).get("html")
 
         if not image_url:
-            logger.warning(f"Found Unsplash result for '{plant_name}' but missing image URL.")
+            logger.warning("Found Unsplash result for '%s' but missing image URL.", plant_name)
             return None
 
-        logger.info(f"Found Unsplash image for '{plant_name}' by {photographer_name}")
+        logger.info("Found Unsplash image for '%s' by %s", plant_name, photographer_name)
         return {
             "unsplash_image_url": image_url,
             "unsplash_photographer_name": photographer_name,
             "unsplash_photographer_url": photographer_url,
         }
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error calling Unsplash API for '{plant_name}': {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            logger.error(f"Unsplash Response Status: {e.response.status_code}")
-            logger.error(f"Unsplash Response Text: {e.response.text}")
-        return None
-    except (KeyError, IndexError, TypeError) as e:
-        logger.error(f"Error parsing Unsplash response for '{plant_name}': {e} - Response: {response.text if 'response' in locals() else 'N/A'}")
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        logger.error("Error parsing Unsplash response for '%s': %s - Response: %s", plant_name, e, response.text)
         return None
     except Exception as e:
-        logger.error(f"An unexpected error occurred during Unsplash call for '{plant_name}': {e}")
+        logger.error("An unexpected error occurred during Unsplash call for '%s': %s", plant_name, e)
         return None 
\ No newline at end of file
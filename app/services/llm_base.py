@@ -1,46 +1,159 @@
+import openai
 from openai import OpenAI
-import json
+import hashlib
 import logging
 import re
-from typing import Optional, Dict, Any
+import string
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, Callable, FrozenSet
 
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from ..config import OPENROUTER_API_KEY, LLM_MODEL, LLM_TIMEOUT_SECONDS, LLM_MAX_RETRIES, USE_STRUCTURED_OUTPUTS
+import orjson
+from ..config import (
+    OPENROUTER_API_KEY,
+    LLM_MODEL,
+    LLM_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES,
+    USE_STRUCTURED_OUTPUTS,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    DEBUG_PERSIST_RAW_LLM,
+)
+from .ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# One shared client so requests reuse its connection pool instead of reconnecting per call.
+# SDK retries are off; _request_llm_completion is the single retry layer.
+_openai_client: Optional[OpenAI] = (
+    OpenAI(base_url="https://openrouter.ai/api/v1", api_key=OPENROUTER_API_KEY, max_retries=0)
+    if OPENROUTER_API_KEY else None
+)
+
+# Transient failures worth retrying: network errors and timeouts, 429s and 5xx responses.
+# Other API errors (bad request, auth) fail immediately.
+_RETRYABLE_LLM_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+# Completed LLM results keyed by a hash of everything that affects the answer
+_llm_cache = TTLCache(maxsize=LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_TTL_SECONDS)
+
+# JSON mode: the provider guarantees a syntactically valid JSON object without a full schema
+JSON_OBJECT_RESPONSE_FORMAT: Dict[str, Any] = {"type": "json_object"}
+
+# Requests currently being sent, keyed like the cache; identical concurrent callers wait on the first one
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Markdown code fence around a JSON body, e.g. ```json ... ```
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```', re.IGNORECASE)
+
 def extract_json_from_response(content: str) -> str:
     """Extract JSON from markdown code blocks or raw text."""
+    stripped = content.strip()
+    # Structured outputs usually return bare JSON; skip the fence scan entirely
+    if stripped.startswith(('{', '[')):
+        return stripped
+
     # Remove markdown code blocks if present
-    json_pattern = r'```(?:json)?\s*([\s\S]*?)\s*```'
-    match = re.search(json_pattern, content, re.IGNORECASE)
+    match = _JSON_FENCE_RE.search(content)
     
     if match:
         return match.group(1).strip()
     else:
-        return content.strip()
+        return stripped
 
-@retry(
-    reraise=True,
-    stop=stop_after_attempt(LLM_MAX_RETRIES),
-    wait=wait_exponential(multiplier=0.5, min=0.5, max=8),
-    retry=retry_if_exception_type(Exception),
-)
-def make_llm_request(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Helper function to make requests to OpenRouter API using OpenAI client."""
-    if not OPENROUTER_API_KEY:
+def _llm_cache_key(payload: Dict[str, Any], response_format: Optional[Dict[str, Any]]) -> str:
+    """SHA-256 over the model, messages, sampling params and response format of a request."""
+    key_material = {
+        "model": payload.get("model", LLM_MODEL),
+        "messages": payload.get("messages", []),
+        "max_tokens": payload.get("max_tokens", 3000),
+        "temperature": payload.get("temperature", 0.2),
+        "response_format": response_format,
+    }
+    encoded = orjson.dumps(key_material, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(encoded).hexdigest()
+
+def _is_cacheable(result: Optional[Dict[str, Any]]) -> bool:
+    """Only complete JSON answers are cached; truncated, filtered or malformed ones are asked again next time."""
+    if result is None or result.get("finish_reason") != "stop":
+        return False
+    try:
+        orjson.loads(result["content"])
+    except (orjson.JSONDecodeError, TypeError):
+        return False
+    return True
+
+def make_llm_request(payload: Dict[str, Any], use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Helper function to make requests to OpenRouter API using OpenAI client.
+    Identical requests are served from an in-process cache, and identical requests that
+    arrive while one is in flight share its result instead of calling the LLM again.
+    use_cache=False sends a fresh, unshared request without hashing the payload, e.g. when
+    retrying after a cached answer was rejected or when the caller caches by its own key
+    (vision requests, whose payload carries a whole base64 image).
+    """
+    if _openai_client is None:
         logger.error("OpenRouter API Key is missing.")
         return None
 
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=OPENROUTER_API_KEY,
-    )
+    # Pass through response_format when structured outputs are enabled and provided
+    response_format = payload.get("response_format") if USE_STRUCTURED_OUTPUTS else None
+
+    if not use_cache:
+        return _request_llm_completion(payload, response_format)
 
+    cache_enabled = LLM_CACHE_TTL_SECONDS > 0
+    cache_key = _llm_cache_key(payload, response_format)
+    if cache_enabled:
+        cached = _llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info("LLM cache hit for model %s", payload.get('model', LLM_MODEL))
+            return dict(cached)
+
+    with _inflight_lock:
+        inflight = _inflight.get(cache_key)
+        if inflight is None:
+            future = _inflight[cache_key] = Future()
+    if inflight is not None:
+        # Another thread is already asking the same question; its errors are raised here too
+        logger.info("Waiting on in-flight LLM request for model %s", payload.get('model', LLM_MODEL))
+        shared = inflight.result()
+        return dict(shared) if shared is not None else None
+
+    try:
+        result = _request_llm_completion(payload, response_format)
+        # Cache before releasing waiters so later callers hit the cache, not a new request
+        if cache_enabled and _is_cacheable(result):
+            _llm_cache.set(cache_key, dict(result))
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+    return result
+
+def _request_llm_completion(payload: Dict[str, Any], response_format: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Call OpenRouter, retrying transient errors with exponential backoff (0.5s, 1s, 2s, ... up to 8s)."""
+    attempts = max(1, LLM_MAX_RETRIES)
+    for attempt in range(attempts):
+        try:
+            return _create_completion(payload, response_format)
+        except _RETRYABLE_LLM_ERRORS as e:
+            if attempt == attempts - 1:
+                raise
+            delay = min(8.0, 0.5 * 2 ** attempt)
+            logger.warning("Transient OpenRouter error (attempt %s/%s): %s. Retrying in %ss", attempt + 1, attempts, e, delay)
+            time.sleep(delay)
+
+def _create_completion(payload: Dict[str, Any], response_format: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Call OpenRouter once through the shared OpenAI client."""
     try:
-        # Pass through response_format when structured outputs are enabled and provided
-        response_format = payload.get("response_format") if USE_STRUCTURED_OUTPUTS else None
-        completion = client.chat.completions.create(
+        completion = _openai_client.chat.completions.create(
             extra_headers={
                 "HTTP-Referer": "http://localhost",
                 "X-Title": "Plant Care API",
@@ -62,7 +175,7 @@ def make_llm_request(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
         if parsed_obj is not None:
             # Use the parsed object directly to avoid truncation issues in message.content
-            clean_content = json.dumps(parsed_obj, ensure_ascii=False)
+            clean_content = orjson.dumps(parsed_obj).decode("utf-8")
             raw_content = clean_content
         else:
             # Prefer message.content; some providers place structured JSON in `message.reasoning`
@@ -80,42 +193,81 @@ def make_llm_request(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             logger.warning("Received empty content from LLM.")
             return None
 
-        # Include both the clean JSON content and the full raw response object
-        return {"content": clean_content, "raw_response": completion.model_dump(), "raw_text": raw_content}
+        finish_reason = completion.choices[0].finish_reason
+        # Include the clean JSON content, the raw text, and only the response metadata
+        # worth keeping (dumping the whole completion copies every choice and message again)
+        return {
+            "content": clean_content,
+            # Structured object from the SDK when available, so callers can skip parsing content
+            "parsed": parsed_obj,
+            "raw_response": {
+                "id": completion.id,
+                "model": completion.model,
+                "usage": completion.usage.model_dump() if completion.usage else None,
+                "finish_reason": finish_reason,
+            },
+            "raw_text": raw_content,
+            "finish_reason": finish_reason,
+        }
     
     except Exception as e:
-        logger.error(f"Error calling OpenRouter API: {e}")
+        logger.error("Error calling OpenRouter API: %s", e)
         raise
 
-def validate_and_parse_response(result: Dict[str, Any], required_keys: list, plant_type: str, plant_name: str) -> Optional[Dict[str, Any]]:
-    """Common validation logic for LLM responses."""
+def validate_and_parse_response(result: Dict[str, Any], required_keys: FrozenSet[str], plant_type: str, plant_name: str) -> Optional[Dict[str, Any]]:
+    """Common validation logic for LLM responses; required_keys is a frozenset checked with one issubset call."""
     if not result:
         return None
 
-    # Check if JSON response appears to be truncated
-    if not result["content"].rstrip().endswith('}'):
-        logger.warning(f"LLM response appears to be truncated for {plant_type}. Content length: {len(result['content'])}")
+    # The model stopped at max_tokens, so the JSON is cut off
+    if result.get("finish_reason") == "length":
+        logger.warning("LLM response was truncated for %s. Content length: %s", plant_type, len(result['content']))
         return None
 
     try:
-        care_info = json.loads(result["content"])
-        if not all(k in care_info for k in required_keys):
-            logger.error(f"LLM JSON missing essential keys for {plant_type}: {care_info}")
+        parsed = result.get("parsed")
+        # Copy parsed objects: results may be shared through the LLM cache and are annotated below
+        care_info = dict(parsed) if isinstance(parsed, dict) else orjson.loads(result["content"])
+        if not isinstance(care_info, dict) or not required_keys.issubset(care_info):
+            logger.error("LLM JSON missing essential keys for %s: %s", plant_type, care_info)
             return None
-        # Attach raw payload for downstream persistence
-        try:
-            care_info["__raw_llm_response"] = result.get("raw_response")
+        # Attach lightweight response metadata for downstream persistence; the raw text
+        # is only kept when debugging. "__" keys are stripped before responding.
+        raw_response = result.get("raw_response") or {}
+        care_info["__raw_llm_response"] = {
+            "model": raw_response.get("model"),
+            "usage": raw_response.get("usage"),
+            "finish_reason": result.get("finish_reason"),
+        }
+        if DEBUG_PERSIST_RAW_LLM:
             care_info["__raw_llm_text"] = result.get("raw_text") or result.get("content")
-        except Exception:
-            # Non-fatal; continue without raw attachment
-            pass
-        logger.info(f"LLM ({LLM_MODEL}) returned valid JSON for {plant_type} '{plant_name}'")
+        logger.info("LLM (%s) returned valid JSON for %s '%s'", LLM_MODEL, plant_type, plant_name)
         return care_info
-    except json.JSONDecodeError as json_e:
-        logger.error(f"Failed to decode JSON response from LLM for {plant_type}: {json_e}")
-        logger.error(f"LLM Raw Content: {result['content']}")
+    except orjson.JSONDecodeError as json_e:
+        logger.error("Failed to decode JSON response from LLM for %s: %s", plant_type, json_e)
+        logger.error("LLM Raw Content: %s", result['content'])
         return None
 
+def compile_prompt(template: str) -> Callable[..., str]:
+    """
+    Parse a str.format prompt template once and return a function that renders it
+    from keyword arguments, so large templates are not re-parsed on every request.
+    Only plain {name} fields and {{ }} escapes are supported; unused keywords are ignored.
+    """
+    segments = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if literal:
+            segments.append((literal, None))
+        if field_name is not None:
+            if format_spec or conversion or not field_name.isidentifier():
+                raise ValueError(f"Unsupported prompt field: {{{field_name}}}")
+            segments.append((None, field_name))
+
+    def render(**fields: Any) -> str:
+        return "".join(literal if name is None else str(fields[name]) for literal, name in segments)
+
+    return render
+
 def create_payload(prompt: str, max_tokens: int = 3000, temperature: float = 0.2, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Create standard payload for LLM requests."""
     return {
@@ -1,7 +1,13 @@
 import logging
 from typing import Optional, Dict, Any
 
-from ..llm_base import make_llm_request, create_payload, validate_and_parse_response
+from ..llm_base import (
+    make_llm_request,
+    create_payload,
+    validate_and_parse_response,
+    compile_prompt,
+    JSON_OBJECT_RESPONSE_FORMAT,
+)
 from ...config import LLM_MODEL
 from .prompts.houseplants_prompt import HOUSEPLANTS_PROMPT
 from .prompts.edible_plants_prompt import EDIBLE_PLANTS_PROMPT
@@ -27,29 +33,33 @@ HUMAN_FRIENDLY_GROUP = {
     "succulents": "succulent",
 }
 
+# Keys every care response must contain
+CARE_REQUIRED_KEYS = frozenset(('plantName', 'care_plan', 'requirements'))
+
+# Pre-parsed care prompt per prompt group; every prompt is rendered with the same
+# fields (plant_name, user_zone, plant_group) and ignores the ones it does not use
+PROMPT_TABLE = {
+    "houseplants": compile_prompt(HOUSEPLANTS_PROMPT),
+    "edible_annuals": compile_prompt(EDIBLE_PLANTS_PROMPT),
+    "fruit_trees": compile_prompt(FRUIT_TREES_PROMPT),
+    "ornamental_perennials": compile_prompt(ORNAMENTAL_PERENNIALS_PROMPT),
+    "annual_flowers": compile_prompt(ANNUAL_FLOWERS_PROMPT),
+    "bulbs": compile_prompt(BULBS_PROMPT),
+    "succulents": compile_prompt(SUCCULENTS_PROMPT),
+}
+
 def call_openrouter_llm_dispatch(group_key: str, plant_name: str, user_zone: str, plant_group: str) -> Optional[Dict[str, Any]]:
     """Dispatch to the correct prompt and call LLM in a DRY way."""
-    if group_key == "houseplants":
-        prompt = HOUSEPLANTS_PROMPT.format(plant_name=plant_name)
-    elif group_key == "edible_annuals":
-        prompt = EDIBLE_PLANTS_PROMPT.format(plant_name=plant_name, user_zone=user_zone, plant_group=plant_group)
-    elif group_key == "fruit_trees":
-        prompt = FRUIT_TREES_PROMPT.format(plant_name=plant_name, user_zone=user_zone, plant_group=plant_group)
-    elif group_key == "ornamental_perennials":
-        prompt = ORNAMENTAL_PERENNIALS_PROMPT.format(plant_name=plant_name, user_zone=user_zone, plant_group=plant_group)
-    elif group_key == "annual_flowers":
-        prompt = ANNUAL_FLOWERS_PROMPT.format(plant_name=plant_name, user_zone=user_zone, plant_group=plant_group)
-    elif group_key == "bulbs":
-        prompt = BULBS_PROMPT.format(plant_name=plant_name, user_zone=user_zone, plant_group=plant_group)
-    elif group_key == "succulents":
-        prompt = SUCCULENTS_PROMPT.format(plant_name=plant_name, user_zone=user_zone, plant_group=plant_group)
-    else:
-        logger.error(f"Unknown prompt group: {group_key}")
+    render_prompt = PROMPT_TABLE.get(group_key)
+    if render_prompt is None:
+        logger.error("Unknown prompt group: %s", group_key)
         return None
+    prompt = render_prompt(plant_name=plant_name, user_zone=user_zone, plant_group=plant_group)
 
-    payload = create_payload(prompt)
+    # Care prompts vary per group, so ask for JSON mode rather than a per-group schema
+    payload = create_payload(prompt, response_format=JSON_OBJECT_RESPONSE_FORMAT)
     result = make_llm_request(payload)
-    return validate_and_parse_response(result, ['plantName', 'care_plan', 'requirements'], HUMAN_FRIENDLY_GROUP.get(group_key, group_key), plant_name)
+    return validate_and_parse_response(result, CARE_REQUIRED_KEYS, HUMAN_FRIENDLY_GROUP.get(group_key, group_key), plant_name)
 
 def generate_plant_care_instructions(
     plant_name: str,
@@ -70,7 +80,7 @@ def generate_plant_care_instructions(
     # Step 1: Classify plant and get appropriate prompt function
     classification_result = get_plant_group_and_prompt(plant_name)
     if not classification_result:
-        logger.error(f"Failed to classify plant '{plant_name}'")
+        logger.error("Failed to classify plant '%s'", plant_name)
         return None
     # If the input is not a plant, short-circuit with a sentinel
     if not classification_result.get('is_plant', True):
@@ -82,28 +92,15 @@ def generate_plant_care_instructions(
     # Step 2: Call appropriate LLM function based on classification
     care_info = call_openrouter_llm_dispatch(prompt_function, plant_name, user_zone, plant_group)
     if care_info is None:
-        logger.error(f"Failed to generate care instructions for '{plant_name}' using group '{prompt_function}'")
+        logger.error("Failed to generate care instructions for '%s' using group '%s'", plant_name, prompt_function)
         return None
 
+    # Keep the classified group with the result so persistence can run later (e.g. in a background task)
+    care_info["__plant_group"] = plant_group
+
     # Step 3: Optionally store results in database
     if persist_to_db:
-        raw_llm_response = care_info.get('__raw_llm_response') if isinstance(care_info, dict) else None
-        resolved_model_used = (
-            raw_llm_response.get('model') if isinstance(raw_llm_response, dict) and raw_llm_response.get('model') else LLM_MODEL
-        )
-
-        storage_success = store_plant_and_care_instructions(
-            original_plant_name=plant_name,
-            original_user_zone=user_zone,
-            care_info=care_info,
-            model_used=resolved_model_used,
-            plant_group=plant_group
-        )
-        
-        if not storage_success:
-            logger.error("Failed to store primary plant/care information in Supabase.")
-            # Still return the care_info even if storage fails
-            # The API can decide whether to raise an error or not
+        persist_plant_care_instructions(plant_name, user_zone, care_info, plant_group)
     
     # Step 4: Optionally fetch and store image (can be moved to background)
     if perform_image_handling:
@@ -113,14 +110,43 @@ def generate_plant_care_instructions(
             if image_data:
                 store_plant_image(corrected_plant_name, image_data)
             else:
-                logger.info(f"No image data found for '{corrected_plant_name}', skipping image storage.")
+                logger.info("No image data found for '%s', skipping image storage.", corrected_plant_name)
         except Exception as e:
-            logger.error(f"Error during image handling for '{plant_name}': {e}")
+            logger.error("Error during image handling for '%s': %s", plant_name, e)
             # Don't let image errors affect the main result
     
     return care_info
 
 
+def persist_plant_care_instructions(
+    plant_name: str,
+    user_zone: str,
+    care_info: Dict[str, Any],
+    plant_group: Optional[str] = None,
+) -> bool:
+    """Store generated care instructions in Supabase; background-friendly and never raises."""
+    try:
+        raw_llm_response = care_info.get('__raw_llm_response') if isinstance(care_info, dict) else None
+        resolved_model_used = (
+            raw_llm_response.get('model') if isinstance(raw_llm_response, dict) and raw_llm_response.get('model') else LLM_MODEL
+        )
+
+        storage_success = store_plant_and_care_instructions(
+            original_plant_name=plant_name,
+            original_user_zone=user_zone,
+            care_info=care_info,
+            model_used=resolved_model_used,
+            plant_group=plant_group or care_info.get('__plant_group')
+        )
+    except Exception as e:
+        logger.error("Error storing care instructions for '%s': %s", plant_name, e)
+        return False
+
+    if not storage_success:
+        logger.error("Failed to store primary plant/care information in Supabase.")
+    return storage_success
+
+
 def fetch_and_store_image_for_plant(plant_name: str) -> None:
     """Background-friendly helper to fetch Unsplash image data and store it."""
     try:
@@ -128,6 +154,6 @@ def fetch_and_store_image_for_plant(plant_name: str) -> None:
         if image_data:
             store_plant_image(plant_name, image_data)
         else:
-            logger.info(f"No image data found for '{plant_name}', skipping image storage.")
+            logger.info("No image data found for '%s', skipping image storage.", plant_name)
     except Exception as e:
-        logger.error(f"Background image handling error for '{plant_name}': {e}")
\ No newline at end of file
+        logger.error("Background image handling error for '%s': %s", plant_name, e)
\ No newline at end of file
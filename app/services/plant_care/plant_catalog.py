@@ -0,0 +1,260 @@
+"""
+Curated plant names with an unambiguous care group, used to classify common plants
+without an LLM round-trip. Anything not listed here falls back to the LLM classifier.
+"""
+from typing import Dict, Optional, Tuple
+
+# Common and botanical names per care group. Keep entries lowercase; only add names
+# whose group does not depend on context (e.g. "geranium" alone is left to the LLM).
+_CATALOG: Dict[str, Tuple[str, ...]] = {
+    "Vegetables": (
+        "tomato", "cherry tomato", "roma tomato", "beefsteak tomato", "heirloom tomato",
+        "grape tomato", "plum tomato", "solanum lycopersicum", "tomatillo",
+        "pepper", "bell pepper", "sweet pepper", "chili pepper", "chile pepper", "hot pepper",
+        "jalapeno", "jalapeño", "habanero", "serrano pepper", "poblano", "cayenne pepper",
+        "capsicum", "capsicum annuum", "eggplant", "aubergine", "potato", "sweet potato",
+        "lettuce", "romaine", "romaine lettuce", "iceberg lettuce", "butterhead lettuce",
+        "lactuca sativa", "spinach", "kale", "chard", "swiss chard", "collards", "collard greens",
+        "arugula", "mustard greens", "bok choy", "pak choi", "napa cabbage",
+        "cabbage", "red cabbage", "broccoli", "cauliflower", "brussels sprouts", "kohlrabi",
+        "carrot", "daucus carota", "beet", "beetroot", "radish", "daikon", "turnip", "rutabaga",
+        "parsnip", "onion", "red onion", "yellow onion", "green onion", "scallion", "spring onion",
+        "shallot", "leek", "garlic", "celery", "celeriac", "fennel", "asparagus", "artichoke",
+        "globe artichoke", "rhubarb", "okra", "corn", "sweet corn", "zea mays",
+        "cucumber", "cucumis sativus", "zucchini", "courgette", "squash", "summer squash",
+        "winter squash", "butternut squash", "acorn squash", "spaghetti squash", "pumpkin",
+        "cucurbita pepo", "watermelon", "cantaloupe", "honeydew", "melon", "muskmelon",
+        "pea", "snap pea", "snow pea", "sugar snap pea", "garden pea", "green bean",
+        "bush bean", "pole bean", "lima bean", "fava bean", "broad bean", "edamame",
+        "runner bean", "black bean", "pinto bean", "kidney bean", "chickpea",
+        "strawberry", "ground cherry", "husk cherry", "peanut",
+        "brandywine tomato", "san marzano tomato", "early girl tomato", "better boy tomato",
+        "celebrity tomato", "cherokee purple tomato", "sungold tomato", "sungold cherry tomato",
+        "sweet 100 tomato", "banana pepper", "ghost pepper", "shishito pepper", "anaheim pepper",
+        "jalapeno pepper", "jalapeño pepper", "habanero pepper", "poblano pepper", "thai chili",
+        "japanese eggplant", "yukon gold potato", "russet potato", "fingerling potato",
+        "butter lettuce", "leaf lettuce", "red leaf lettuce", "green leaf lettuce",
+        "lacinato kale", "dinosaur kale", "tuscan kale", "curly kale", "english cucumber",
+        "pickling cucumber", "persian cucumber", "sugar pumpkin", "pie pumpkin",
+        "delicata squash", "kabocha squash", "sweet onion", "vidalia onion",
+    ),
+    "Herbs": (
+        "basil", "sweet basil", "thai basil", "genovese basil", "holy basil", "ocimum basilicum",
+        "rosemary", "salvia rosmarinus", "rosmarinus officinalis", "thyme", "lemon thyme",
+        "thymus vulgaris", "oregano", "origanum vulgare", "marjoram", "sage", "common sage",
+        "garden sage", "salvia officinalis", "mint", "peppermint", "spearmint", "chocolate mint",
+        "apple mint", "mentha", "parsley", "flat leaf parsley", "curly parsley",
+        "petroselinum crispum", "cilantro", "coriander", "coriandrum sativum", "dill",
+        "anethum graveolens", "chives", "garlic chives", "tarragon", "french tarragon",
+        "lemongrass", "lemon balm", "lovage", "sorrel", "chervil", "bay laurel", "bay leaf",
+        "stevia", "borage", "chamomile", "german chamomile", "feverfew", "comfrey",
+        "catnip", "hyssop", "summer savory", "winter savory", "epazote", "shiso", "perilla",
+        "culantro", "vietnamese coriander", "fenugreek", "caraway", "cumin", "valerian",
+        "horseradish", "wasabi", "ginger", "turmeric", "mexican oregano", "rue", "angelica",
+        "lemon basil", "cinnamon basil", "italian parsley", "english thyme", "greek oregano",
+        "pineapple sage", "lemon verbena",
+    ),
+    "Fruit Trees": (
+        "apple", "apple tree", "malus domestica", "pear", "pear tree", "asian pear",
+        "peach", "peach tree", "nectarine", "plum", "plum tree", "apricot", "cherry",
+        "cherry tree", "sweet cherry", "sour cherry", "tart cherry", "prunus avium",
+        "fig", "fig tree", "common fig", "ficus carica", "mission fig", "brown turkey fig",
+        "lemon", "lemon tree", "meyer lemon", "lime", "lime tree", "key lime", "orange",
+        "orange tree", "navel orange", "blood orange", "grapefruit", "mandarin", "tangerine",
+        "clementine", "kumquat", "satsuma", "citrus", "pomegranate", "persimmon",
+        "avocado", "avocado tree", "mango", "mango tree", "papaya", "banana", "olive",
+        "olive tree", "quince", "loquat", "mulberry", "pawpaw", "guava", "feijoa",
+        "pineapple guava", "lychee", "jujube", "tamarillo", "tree tomato", "almond", "walnut",
+        "pecan", "hazelnut", "chestnut", "blueberry", "blueberry bush", "raspberry",
+        "blackberry", "boysenberry", "gooseberry", "currant", "black currant", "red currant",
+        "elderberry", "honeyberry", "haskap", "goji berry", "aronia", "sea buckthorn",
+        "grape", "grapevine", "grape vine", "kiwi", "kiwifruit", "hardy kiwi",
+        "honeycrisp apple", "granny smith apple", "fuji apple", "gala apple", "bartlett pear",
+        "bing cherry", "rainier cherry", "elberta peach", "valencia orange", "eureka lemon",
+        "persian lime", "hass avocado", "concord grape",
+    ),
+    "Flowering Shrubs": (
+        "rose", "roses", "rose bush", "knock out rose", "climbing rose", "hybrid tea rose",
+        "floribunda rose", "shrub rose", "hydrangea", "bigleaf hydrangea", "panicle hydrangea",
+        "oakleaf hydrangea", "smooth hydrangea", "hydrangea macrophylla", "azalea",
+        "rhododendron", "camellia", "gardenia", "lilac", "syringa vulgaris", "forsythia",
+        "spirea", "weigela", "viburnum", "butterfly bush", "buddleja", "buddleia",
+        "rose of sharon", "hibiscus syriacus", "mock orange", "mock-orange", "deutzia",
+        "potentilla", "boxwood", "holly", "barberry", "ninebark", "abelia", "daphne",
+        "pieris", "mountain laurel", "oleander", "bougainvillea", "camellia japonica",
+        "camellia sasanqua", "fothergilla", "clethra", "summersweet", "sweetshrub",
+        "beautyberry", "winterberry", "quince bush", "flowering quince", "kerria",
+        "loropetalum", "lavender", "english lavender", "french lavender", "lavandula",
+        "russian sage", "caryopteris", "privet", "hebe", "leucothoe", "indian hawthorn",
+    ),
+    "Perennial Flowers": (
+        "hosta", "daylily", "day lily", "hemerocallis", "peony", "peonies", "paeonia",
+        "coneflower", "purple coneflower", "echinacea", "echinacea purpurea", "black eyed susan",
+        "black-eyed susan", "rudbeckia", "rudbeckia hirta", "shasta daisy",
+        "coreopsis", "perennial salvia", "yarrow", "achillea", "bee balm", "monarda",
+        "phlox", "garden phlox", "creeping phlox", "astilbe", "bleeding heart", "columbine",
+        "aquilegia", "coral bells", "heuchera", "hellebore", "lenten rose", "christmas rose",
+        "catmint", "cat mint", "nepeta", "delphinium", "foxglove",
+        "lupine", "lupin", "iris", "bearded iris", "siberian iris", "japanese iris",
+        "aster", "new england aster", "chrysanthemum", "hardy mum",
+        "gaillardia", "blanket flower", "penstemon", "veronica", "speedwell",
+        "hardy geranium", "cranesbill", "lamb's ear", "lambs ear", "dianthus",
+        "carnation", "hollyhock", "campanula", "bellflower", "scabiosa", "pincushion flower",
+        "ajuga", "bugleweed", "lily of the valley", "lily-of-the-valley", "japanese anemone",
+        "ligularia", "goldenrod", "joe pye weed", "sneezeweed", "helenium", "tickseed",
+        "primrose", "primula", "candytuft", "creeping jenny", "verbena bonariensis",
+        "water lily", "lotus", "canna", "canna lily", "ornamental grass", "fountain grass",
+        "blue fescue", "hakonechloa", "japanese forest grass",
+    ),
+    "Annual Flowers": (
+        "marigold", "french marigold", "african marigold", "tagetes", "petunia", "petunias",
+        "impatiens", "new guinea impatiens", "zinnia", "zinnias", "sunflower", "helianthus annuus",
+        "cosmos", "snapdragon", "antirrhinum", "begonia", "wax begonia",
+        "pelargonium", "zonal geranium", "ivy geranium", "lobelia", "alyssum", "sweet alyssum",
+        "nasturtium", "calendula", "pot marigold", "cornflower", "bachelor's button",
+        "bachelors button", "poppy", "california poppy", "iceland poppy", "larkspur",
+        "sweet pea", "morning glory", "moonflower", "celosia", "cockscomb", "coleus",
+        "vinca", "annual vinca", "periwinkle", "verbena", "salvia splendens", "scarlet sage",
+        "ageratum", "nicotiana", "flowering tobacco", "cleome", "spider flower", "gomphrena",
+        "globe amaranth", "amaranth", "love in a mist", "nigella", "pansy", "pansies",
+        "viola", "johnny jump up", "torenia", "wishbone flower", "lantana", "portulaca",
+        "moss rose", "calibrachoa", "million bells", "bacopa", "dusty miller", "strawflower",
+        "statice", "lisianthus", "dahlberg daisy", "osteospermum", "african daisy",
+        "gerbera daisy", "ornamental kale", "ornamental cabbage", "ornamental pepper",
+        "castor bean", "thorn apple", "datura", "sweet potato vine", "four o'clock",
+        "four o'clocks", "mexican sunflower", "tithonia", "cupflower", "nierembergia",
+    ),
+    "Ornamental Trees": (
+        "maple", "japanese maple", "red maple", "sugar maple", "silver maple", "acer palmatum",
+        "acer rubrum", "oak", "red oak", "white oak", "live oak", "pin oak", "quercus",
+        "dogwood", "flowering dogwood", "kousa dogwood", "cornus florida", "redbud",
+        "eastern redbud", "cercis canadensis", "magnolia", "southern magnolia", "saucer magnolia",
+        "star magnolia", "crabapple", "crab apple", "flowering crabapple", "flowering cherry",
+        "cherry blossom", "cherry blossom tree", "yoshino cherry", "kwanzan cherry",
+        "weeping cherry", "flowering plum", "purple leaf plum", "flowering pear",
+        "bradford pear", "callery pear", "crape myrtle", "crepe myrtle", "lagerstroemia",
+        "birch", "river birch", "paper birch", "white birch", "aspen", "quaking aspen",
+        "willow", "weeping willow", "pussy willow", "elm", "american elm", "linden",
+        "basswood", "beech", "european beech", "sycamore", "plane tree", "london plane",
+        "ginkgo", "ginkgo biloba", "tulip tree", "tulip poplar", "sweetgum", "black gum",
+        "tupelo", "hawthorn", "serviceberry", "amelanchier", "smoketree", "smoke tree",
+        "japanese tree lilac", "golden rain tree", "goldenrain tree", "catalpa", "mimosa",
+        "mimosa tree", "silk tree", "chaste tree", "vitex", "jacaranda", "eucalyptus",
+        "pine", "white pine", "scots pine", "spruce", "blue spruce", "colorado blue spruce",
+        "norway spruce", "fir", "douglas fir", "fraser fir", "cedar", "deodar cedar",
+        "hemlock", "cypress", "leyland cypress", "bald cypress", "arborvitae", "thuja",
+        "juniper", "yew", "larch", "dawn redwood", "redwood", "sequoia", "honey locust",
+        "black locust", "horse chestnut", "buckeye", "hornbeam", "katsura", "osage orange",
+        "palm tree", "queen palm", "royal palm", "windmill palm", "mexican fan palm",
+    ),
+    "Houseplants": (
+        "pothos", "golden pothos", "epipremnum aureum", "devil's ivy", "devils ivy",
+        "monstera", "monstera deliciosa", "swiss cheese plant", "philodendron",
+        "heartleaf philodendron", "split leaf philodendron", "philodendron brasil",
+        "fiddle leaf fig", "fiddle-leaf fig", "fiddle leaf fig tree", "ficus lyrata",
+        "weeping fig", "ficus benjamina", "rubber plant", "rubber tree", "ficus elastica",
+        "creeping fig", "ficus pumila", "peace lily", "spathiphyllum", "snake plant",
+        "sansevieria", "dracaena trifasciata", "mother in law's tongue", "mother-in-law's tongue",
+        "zz plant", "zamioculcas", "zamioculcas zamiifolia", "spider plant",
+        "chlorophytum comosum", "chinese evergreen", "aglaonema", "dracaena", "corn plant",
+        "dracaena marginata", "dragon tree", "lucky bamboo", "cast iron plant", "aspidistra",
+        "calathea", "prayer plant", "maranta", "stromanthe", "ctenanthe", "peperomia",
+        "watermelon peperomia", "baby rubber plant", "pilea", "pilea peperomioides",
+        "chinese money plant", "money tree", "pachira aquatica", "parlor palm", "areca palm",
+        "kentia palm", "majesty palm", "bamboo palm", "cat palm", "boston fern",
+        "maidenhair fern", "bird's nest fern", "birds nest fern", "staghorn fern",
+        "asparagus fern", "english ivy", "hedera helix", "arrowhead plant", "syngonium",
+        "dieffenbachia", "dumb cane", "croton", "schefflera", "umbrella tree", "umbrella plant",
+        "anthurium", "flamingo flower", "bromeliad", "guzmania", "air plant", "tillandsia",
+        "orchid", "moth orchid", "phalaenopsis", "african violet", "saintpaulia",
+        "polka dot plant", "nerve plant", "fittonia", "tradescantia", "wandering jew",
+        "inch plant", "string of pearls", "string of hearts", "hoya", "wax plant",
+        "norfolk island pine", "alocasia", "elephant ear plant", "african mask plant",
+        "bird of paradise", "strelitzia", "strelitzia nicolai", "peacock plant",
+        "rattlesnake plant", "purple waffle plant", "friendship plant", "begonia rex",
+        "rex begonia", "venus flytrap", "pitcher plant", "christmas cactus",
+        "thanksgiving cactus", "easter cactus", "schlumbergera", "kalanchoe",
+        "poinsettia", "cyclamen", "gloxinia", "lipstick plant", "goldfish plant",
+    ),
+    "Succulents": (
+        "succulent", "cactus", "cacti", "echeveria", "jade plant", "crassula ovata",
+        "aloe", "aloe vera", "haworthia", "zebra plant", "sedum", "stonecrop",
+        "burro's tail", "burros tail", "donkey tail", "hens and chicks", "hens and chickens",
+        "sempervivum", "agave", "century plant", "yucca", "ponytail palm", "beaucarnea recurvata",
+        "sago palm", "cycas revoluta", "desert rose", "adenium", "lithops", "living stones",
+        "panda plant", "kalanchoe tomentosa", "paddle plant", "flapjack plant", "graptopetalum",
+        "ghost plant", "graptoveria", "pachyphytum", "aeonium", "gasteria", "euphorbia",
+        "crown of thorns", "pencil cactus", "firestick plant", "prickly pear", "opuntia",
+        "barrel cactus", "saguaro", "golden barrel cactus", "bunny ear cactus", "moon cactus",
+        "old man cactus", "mammillaria", "echinopsis", "ice plant", "delosperma",
+        "string of bananas", "string of dolphins", "senecio", "portulacaria afra",
+        "elephant bush", "dudleya", "sansevieria cylindrica",
+    ),
+    "Bulbs": (
+        "tulip", "tulips", "tulipa", "daffodil", "daffodils", "narcissus", "jonquil",
+        "paperwhite", "paperwhites", "hyacinth", "grape hyacinth", "muscari", "crocus",
+        "saffron crocus", "allium", "ornamental onion", "giant allium", "gladiolus", "gladioli",
+        "dahlia", "dahlias", "lily", "asiatic lily", "oriental lily", "tiger lily",
+        "easter lily", "lilium", "calla lily", "zantedeschia", "amaryllis", "hippeastrum",
+        "snowdrop", "snowdrops", "galanthus", "freesia", "ranunculus",
+        "iris reticulata", "dwarf iris", "fritillaria", "crown imperial", "scilla",
+        "siberian squill", "glory of the snow", "chionodoxa", "camassia",
+        "tuberous begonia", "caladium", "elephant ear", "colocasia", "crocosmia",
+        "agapanthus", "lily of the nile", "nerine", "oxalis", "winter aconite", "star of bethlehem",
+    ),
+    "Native Plants": (
+        "milkweed", "common milkweed", "swamp milkweed", "butterfly weed", "asclepias",
+        "asclepias tuberosa", "switchgrass", "little bluestem", "big bluestem", "prairie dropseed",
+        "mountain mint", "wild bergamot", "trillium", "bloodroot", "virginia bluebells",
+        "wild ginger", "mayapple", "jack in the pulpit", "jack-in-the-pulpit", "skunk cabbage",
+        "partridge pea", "purple prairie clover", "rattlesnake master", "compass plant",
+        "prairie smoke", "wild columbine", "cardinal flower", "great blue lobelia",
+        "blazing star", "liatris", "ironweed", "spotted joe pye weed", "boneset",
+        "golden alexanders", "wild indigo", "baptisia", "spiderwort", "culver's root",
+        "foamflower", "tiarella", "dutchman's breeches", "jacob's ladder",
+    ),
+}
+
+KNOWN_PLANTS: Dict[str, str] = {
+    name: group for group, names in _CATALOG.items() for name in names
+}
+
+# Leading words that describe a size, habit or color rather than a different plant, so
+# "dwarf lilac" or "purple basil" resolve like "lilac" and "basil". Anything else in front
+# of a catalog name ("sea cucumber", "sweet olive", "baked potato") is left to the LLM.
+_HARMLESS_MODIFIERS = frozenset((
+    "dwarf", "giant", "miniature", "mini", "compact", "variegated",
+    "red", "white", "yellow", "purple", "pink", "blue",
+))
+
+
+def _singular_forms(word: str) -> Tuple[str, ...]:
+    """The word plus naive singular forms: berries -> berry, tomatoes -> tomato, hostas -> hosta."""
+    if word.endswith("ies"):
+        return (word, word[:-3] + "y")
+    if word.endswith("es"):
+        return (word, word[:-2], word[:-1])
+    if word.endswith("s") and not word.endswith("ss"):
+        return (word, word[:-1])
+    return (word,)
+
+
+def lookup_plant_group(plant_name: str) -> Optional[str]:
+    """
+    Return the care group for a well-known plant name, or None to defer to the LLM.
+
+    Tries the whole normalized name and its singular forms, then the same again with
+    leading harmless modifiers ("dwarf", color words) removed. Names are never resolved
+    from their last word alone; multi-word varieties need their own catalog entry.
+    """
+    words = plant_name.strip().lower().split()
+    while words:
+        key = " ".join(words)
+        for candidate in _singular_forms(key):
+            group = KNOWN_PLANTS.get(candidate)
+            if group:
+                return group
+        if len(words) < 2 or words[0] not in _HARMLESS_MODIFIERS:
+            return None
+        words = words[1:]
+    return None
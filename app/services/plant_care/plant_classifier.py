@@ -1,119 +1,315 @@
-import json
 import logging
-from typing import Optional, Dict
+import random
+import time
+from enum import Enum
+from typing import Any, Optional, Dict, FrozenSet, List, Tuple
 
-from ..llm_base import make_llm_request, create_payload
-from .prompts.plant_classification_prompt import PLANT_CLASSIFICATION_PROMPT
+import orjson
+
+from ..llm_base import make_llm_request, create_payload, compile_prompt
+from ..ttl_cache import TTLCache
+from .plant_catalog import lookup_plant_group
+from .prompts.plant_classification_prompt import PLANT_CLASSIFICATION_PROMPT, PLANT_BATCH_CLASSIFICATION_PROMPT
 
 logger = logging.getLogger(__name__)
 
-# Map detailed care categories to prompt functions
-CATEGORY_TO_PROMPT = {
-    "Vegetables": "edible_annuals",
-    "Herbs": "edible_annuals",
-    "Fruit Trees": "fruit_trees",
-    "Flowering Shrubs": "ornamental_perennials",
-    "Perennial Flowers": "ornamental_perennials", 
-    "Ornamental Trees": "ornamental_perennials",
-    "Annual Flowers": "annual_flowers",
-    "Houseplants": "houseplants",
-    "Succulents": "succulents",
-    "Bulbs": "bulbs",
-    "Native Plants": "ornamental_perennials"  # Native plants use ornamental perennial structure
+class PlantGroup(str, Enum):
+    """Care categories the classifier assigns; values are the labels the LLM returns."""
+    VEGETABLES = "Vegetables"
+    HERBS = "Herbs"
+    FRUIT_TREES = "Fruit Trees"
+    FLOWERING_SHRUBS = "Flowering Shrubs"
+    PERENNIAL_FLOWERS = "Perennial Flowers"
+    ANNUAL_FLOWERS = "Annual Flowers"
+    ORNAMENTAL_TREES = "Ornamental Trees"
+    HOUSEPLANTS = "Houseplants"
+    SUCCULENTS = "Succulents"
+    BULBS = "Bulbs"
+    NATIVE_PLANTS = "Native Plants"
+
+
+# Map detailed care categories to prompt functions. PlantGroup hashes and compares like
+# its value, so these tables can be looked up with the plain label from the LLM or catalog.
+CATEGORY_TO_PROMPT: Dict[PlantGroup, str] = {
+    PlantGroup.VEGETABLES: "edible_annuals",
+    PlantGroup.HERBS: "edible_annuals",
+    PlantGroup.FRUIT_TREES: "fruit_trees",
+    PlantGroup.FLOWERING_SHRUBS: "ornamental_perennials",
+    PlantGroup.PERENNIAL_FLOWERS: "ornamental_perennials",
+    PlantGroup.ORNAMENTAL_TREES: "ornamental_perennials",
+    PlantGroup.ANNUAL_FLOWERS: "annual_flowers",
+    PlantGroup.HOUSEPLANTS: "houseplants",
+    PlantGroup.SUCCULENTS: "succulents",
+    PlantGroup.BULBS: "bulbs",
+    PlantGroup.NATIVE_PLANTS: "ornamental_perennials",  # Native plants use ornamental perennial structure
 }
 
-def classify_plant_group(plant_name: str) -> Optional[Dict[str, str]]:
-    """
-    Classify plant to determine which care prompt to use.
-    Returns dict with plant_group.
-    """
-    prompt = PLANT_CLASSIFICATION_PROMPT.format(plant_name=plant_name)
-
-    # Structured output schema for classification with is_plant failsafe
-    classification_schema = {
-        "type": "json_schema",
-        "json_schema": {
-            "name": "PlantGroupClassification",
-            "strict": True,
-            "schema": {
-                "type": "object",
-                "additionalProperties": False,
-                "properties": {
-                    "is_plant": {"type": "boolean"},
-                    "plant_group": {
-                        "type": ["string", "null"],
-                        "enum": [
-                            "Vegetables",
-                            "Herbs",
-                            "Fruit Trees",
-                            "Flowering Shrubs",
-                            "Perennial Flowers",
-                            "Annual Flowers",
-                            "Ornamental Trees",
-                            "Houseplants",
-                            "Succulents",
-                            "Bulbs",
-                            "Native Plants",
-                            None,
-                        ],
+# Finished get_plant_group_and_prompt results per group; callers get a shallow copy.
+# Results carry the plain label, which is what prompts and the database expect.
+_RESULT_TEMPLATES: Dict[PlantGroup, Dict[str, Any]] = {
+    group: {"is_plant": True, "plant_group": group.value, "prompt_function": prompt}
+    for group, prompt in CATEGORY_TO_PROMPT.items()
+}
+
+# Groups the classifier may return
+VALID_PLANT_GROUPS: FrozenSet[PlantGroup] = frozenset(PlantGroup)
+
+# Every valid (is_plant, plant_group) answer and the result it maps to, so an LLM answer
+# is validated with a single lookup: non-plants must have a null group, plants a known one
+_VALID_CLASSIFICATIONS: Dict[Tuple[bool, Optional[PlantGroup]], Dict[str, Any]] = {
+    (False, None): {"is_plant": False},
+    **{(True, group): {"is_plant": True, "plant_group": group.value} for group in PlantGroup},
+}
+
+# Successful LLM classifications keyed by the normalized plant name; results are stable at temperature 0
+_classification_cache = TTLCache(maxsize=10_000, ttl_seconds=7 * 24 * 60 * 60)
+
+# Classification prompts parsed once at import; rendered per request with the plant name(s)
+_render_classification_prompt = compile_prompt(PLANT_CLASSIFICATION_PROMPT)
+_render_batch_classification_prompt = compile_prompt(PLANT_BATCH_CLASSIFICATION_PROMPT)
+
+# Names sent to the LLM per batch request, to keep the prompt and the JSON answer short
+CLASSIFICATION_BATCH_SIZE = 20
+
+# Allowed plant_group values in the structured output schemas; null marks a non-plant
+_PLANT_GROUP_SCHEMA = {
+    "type": ["string", "null"],
+    "enum": [*(group.value for group in PlantGroup), None],
+}
+
+# Structured output schema for classification with is_plant failsafe; built once and
+# shared by every request
+_CLASSIFICATION_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "PlantGroupClassification",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "is_plant": {"type": "boolean"},
+                "plant_group": _PLANT_GROUP_SCHEMA,
+            },
+            "required": ["is_plant", "plant_group"],
+        },
+    },
+}
+
+# Structured output schema for batch classification: one result per input, in input order
+_BATCH_CLASSIFICATION_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "PlantGroupBatchClassification",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "properties": {
+                            "name": {"type": "string"},
+                            "is_plant": {"type": "boolean"},
+                            "plant_group": _PLANT_GROUP_SCHEMA,
+                        },
+                        "required": ["name", "is_plant", "plant_group"],
                     },
                 },
-                "required": ["is_plant", "plant_group"],
             },
+            "required": ["results"],
         },
-    }
+    },
+}
+
+def _normalize_name(plant_name: str) -> str:
+    """Cache and matching key for a plant name: casefolded with whitespace collapsed."""
+    return " ".join(plant_name.casefold().split())
+
+def classify_plant_group(plant_name: str) -> Optional[Dict[str, str]]:
+    """
+    Classify plant to determine which care prompt to use.
+    Returns dict with plant_group. Well-known plants are resolved from the local
+    catalog and repeated names from an in-process cache; the LLM is only asked
+    about names seen for the first time.
+    """
+    known_group = lookup_plant_group(plant_name)
+    if known_group:
+        logger.info("Plant '%s' classified as %s from the plant catalog", plant_name, known_group)
+        return {"is_plant": True, "plant_group": known_group}
+
+    name_key = _normalize_name(plant_name)
+    cached_result = _classification_cache.get(name_key)
+    if cached_result is not None:
+        logger.info("Plant classification cache hit for '%s'", plant_name)
+        return dict(cached_result)
+
+    classification_result = _classify_with_llm(plant_name)
+    if classification_result is not None:
+        # Cache a copy so callers cannot mutate the stored result
+        _classification_cache.set(name_key, dict(classification_result))
+    return classification_result
+
+def _classify_with_llm(plant_name: str) -> Optional[Dict[str, str]]:
+    """Ask the LLM for the plant group, retrying invalid answers; None if every attempt fails."""
+    prompt = _render_classification_prompt(plant_name=plant_name)
 
-    payload = create_payload(prompt, max_tokens=128, temperature=0.0, response_format=classification_schema)
+    payload = create_payload(prompt, max_tokens=128, temperature=0.0, response_format=_CLASSIFICATION_SCHEMA)
     
-    # Try up to 3 attempts to mitigate occasional truncation
+    # Try up to 3 attempts to mitigate occasional truncation; retries skip the LLM cache
+    # so a rejected answer is not simply served again
     for attempt in range(1, 4):
-        result = make_llm_request(payload)
+        if attempt > 1:
+            # Back off before asking again (0.25s, then 0.5s); jitter keeps concurrent retries apart
+            time.sleep(min(8.0, 0.25 * 2 ** (attempt - 2)) + random.uniform(0, 0.1))
+        result = make_llm_request(payload, use_cache=attempt == 1)
         if not result:
             continue
 
-        content = result.get("content", "") or ""
-        # If content appears truncated, retry
-        if not content.rstrip().endswith('}'):
-            logger.warning(f"Attempt {attempt}: classification JSON appears truncated. Retrying...")
+        # The model stopped at max_tokens, so the JSON is cut off; anything else that
+        # does not parse is caught by orjson below
+        if result.get("finish_reason") == "length":
+            logger.warning("Attempt %s: classification JSON appears truncated. Retrying...", attempt)
             continue
+        content = result.get("content", "") or ""
 
         try:
-            classification = json.loads(content)
-        except json.JSONDecodeError as json_e:
-            logger.warning(f"Attempt {attempt}: failed to decode classification JSON: {json_e}. Retrying...")
+            classification = orjson.loads(content)
+        except orjson.JSONDecodeError as json_e:
+            logger.warning("Attempt %s: failed to decode classification JSON: %s. Retrying...", attempt, json_e)
             continue
 
-        # Basic shape validation
-        if "is_plant" not in classification or "plant_group" not in classification:
-            logger.warning(f"Attempt {attempt}: LLM JSON missing required fields: {classification}. Retrying...")
+        validated = _validate_classification(classification)
+        if validated is None:
+            logger.warning("Attempt %s: invalid classification: %s. Retrying...", attempt, classification)
             continue
 
-        is_plant = bool(classification.get("is_plant"))
-        plant_group = classification.get("plant_group")
+        if validated["is_plant"]:
+            logger.info("Plant '%s' classified as: %s", plant_name, classification)
+        else:
+            logger.info("Input '%s' determined to be non-plant.", plant_name)
+        return validated
 
-        valid_plant_groups = [
-            'Vegetables', 'Herbs', 'Fruit Trees', 'Flowering Shrubs', 'Perennial Flowers',
-            'Annual Flowers', 'Ornamental Trees', 'Houseplants', 'Succulents', 'Bulbs', 'Native Plants'
-        ]
+    logger.error("Could not classify plant group for '%s' after retries", plant_name)
+    return None
 
-        if not is_plant:
-            # For non-plant, expect plant_group to be None/null
-            if plant_group is not None:
-                logger.warning(f"Attempt {attempt}: Non-plant must have plant_group=null. Got: {classification}. Retrying...")
-                continue
-            logger.info(f"Input '{plant_name}' determined to be non-plant.")
-            return {"is_plant": False}
+def _validate_classification(classification: Any) -> Optional[Dict[str, Any]]:
+    """
+    Return a copy of the result for a valid LLM classification, or None. Strict structured
+    outputs usually guarantee the shape, but they can be disabled or ignored by a provider.
+    """
+    if not isinstance(classification, dict):
+        return None
+    is_plant = classification.get("is_plant")
+    # True == 1 and False == 0, so without this 1/0 would pass the table lookup
+    if type(is_plant) is not bool:
+        return None
+    try:
+        validated = _VALID_CLASSIFICATIONS.get((is_plant, classification.get("plant_group")))
+    except TypeError:
+        # Unhashable plant_group (e.g. a list)
+        return None
+    return dict(validated) if validated is not None else None
 
-        # is_plant is True: validate group
-        if plant_group not in valid_plant_groups:
-            logger.warning(f"Attempt {attempt}: Invalid plant_group '{plant_group}'. Retrying...")
+def classify_plant_groups_batch(plant_names: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Classify several plants at once, e.g. for an imported plant list.
+
+    Returns one classification per input name, in order, shaped like classify_plant_group's
+    result (None where classification failed). Catalog and cache hits are answered locally;
+    the remaining distinct names go to the LLM in chunks of CLASSIFICATION_BATCH_SIZE per
+    request instead of one request per name.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(plant_names)
+    pending: Dict[str, List[int]] = {}  # normalized name -> positions still to classify
+
+    for index, plant_name in enumerate(plant_names):
+        known_group = lookup_plant_group(plant_name)
+        if known_group:
+            results[index] = {"is_plant": True, "plant_group": known_group}
+            continue
+        name_key = _normalize_name(plant_name)
+        cached_result = _classification_cache.get(name_key)
+        if cached_result is not None:
+            results[index] = dict(cached_result)
             continue
+        pending.setdefault(name_key, []).append(index)
 
-        logger.info(f"Plant '{plant_name}' classified as: {classification}")
-        return {"is_plant": True, "plant_group": plant_group}
+    pending_keys = list(pending)
+    for start in range(0, len(pending_keys), CLASSIFICATION_BATCH_SIZE):
+        chunk = pending_keys[start:start + CLASSIFICATION_BATCH_SIZE]
+        chunk_names = [plant_names[pending[name_key][0]] for name_key in chunk]
+        chunk_results = _classify_batch_with_llm(chunk_names)
 
-    logger.error(f"Could not classify plant group for '{plant_name}' after retries")
-    return None
+        for name_key, plant_name, classification in zip(chunk, chunk_names, chunk_results):
+            if classification is None:
+                # Missing, unmatched or invalid in the batch answer; fall back to the single-name
+                # classifier so only validated answers reach the shared cache
+                classification = _classify_with_llm(plant_name)
+            if classification is None:
+                continue
+            _classification_cache.set(name_key, dict(classification))
+            for index in pending[name_key]:
+                results[index] = dict(classification)
+
+    logger.info(
+        "Classified %s/%s plants with %s sent to the LLM",
+        sum(r is not None for r in results), len(plant_names), len(pending_keys),
+    )
+    return results
+
+def _classify_batch_with_llm(plant_names: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """One LLM request for a chunk of names; returns a result per name, None where the answer was unusable."""
+    numbered_names = "\n".join(f"{number}. {name}" for number, name in enumerate(plant_names, start=1))
+    prompt = _render_batch_classification_prompt(plant_names=numbered_names)
+    payload = create_payload(
+        prompt,
+        max_tokens=64 + 48 * len(plant_names),
+        temperature=0.0,
+        response_format=_BATCH_CLASSIFICATION_SCHEMA,
+    )
+
+    classifications: List[Optional[Dict[str, Any]]] = [None] * len(plant_names)
+    result = make_llm_request(payload)
+    if not result:
+        return classifications
+    if result.get("finish_reason") == "length":
+        logger.warning("Batch classification of %s plants was truncated", len(plant_names))
+        return classifications
+
+    try:
+        items = orjson.loads(result.get("content") or "").get("results")
+    except (orjson.JSONDecodeError, AttributeError) as e:
+        logger.warning("Failed to decode batch classification JSON: %s", e)
+        return classifications
+    if not isinstance(items, list):
+        logger.warning("Batch classification returned no results for %s plants", len(plant_names))
+        return classifications
+
+    # Match answers to inputs by their echoed name, not by position, so a reordered or
+    # skipped item cannot land on the wrong plant. Names answered more than once are ambiguous.
+    answers: Dict[str, Optional[Dict[str, Any]]] = {}
+    duplicated = set()
+    for item in items:
+        name = item.get("name") if isinstance(item, dict) else None
+        if not isinstance(name, str):
+            continue
+        name_key = _normalize_name(name)
+        if name_key in answers:
+            duplicated.add(name_key)
+        answers[name_key] = _validate_classification(item)
+
+    for position, plant_name in enumerate(plant_names):
+        name_key = _normalize_name(plant_name)
+        if name_key not in duplicated:
+            classifications[position] = answers.get(name_key)
+    unmatched = classifications.count(None)
+    if unmatched:
+        logger.warning("Batch classification left %s of %s plants unmatched or invalid", unmatched, len(plant_names))
+    return classifications
 
 def get_plant_group_and_prompt(plant_name: str) -> Optional[Dict[str, str]]:
     """
@@ -126,7 +322,7 @@ def get_plant_group_and_prompt(plant_name: str) -> Optional[Dict[str, str]]:
     plant_classification = classify_plant_group(plant_name)
     
     if plant_classification is None:
-        logger.error(f"Could not classify plant group for '{plant_name}'")
+        logger.error("Could not classify plant group for '%s'", plant_name)
         return None
 
     # If not a plant, bubble up this information
@@ -135,16 +331,12 @@ def get_plant_group_and_prompt(plant_name: str) -> Optional[Dict[str, str]]:
 
     plant_group = plant_classification["plant_group"]
     
-    # Step 2: Map group to prompt function
-    prompt_function = CATEGORY_TO_PROMPT.get(plant_group)
-    if not prompt_function:
-        logger.error(f"No prompt function mapped for plant group: {plant_group}")
+    # Step 2: Map group to its prebuilt result (plant group + prompt function)
+    template = _RESULT_TEMPLATES.get(plant_group)
+    if template is None:
+        logger.error("No prompt function mapped for plant group: %s", plant_group)
         return None
     
-    logger.info(f"Plant '{plant_name}' classified as {plant_group} using {prompt_function} prompt")
+    logger.info("Plant '%s' classified as %s using %s prompt", plant_name, plant_group, template['prompt_function'])
     
-    return {
-        "is_plant": True,
-        "plant_group": plant_group,
-        "prompt_function": prompt_function
-    }
\ No newline at end of file
+    return dict(template)
\ No newline at end of file
@@ -25,4 +25,39 @@ Guidelines:
   - "Native Plants": Plants indigenous to specific regions (varies by location)
 
 Input: {plant_name}
-Response:"""
\ No newline at end of file
+Response:"""
+
+PLANT_BATCH_CLASSIFICATION_PROMPT = """
+For each numbered input below, determine whether it refers to a plant. If it is a plant, classify it into a care category.
+
+Respond with ONLY a JSON object in this exact format, with one result per input in the same order:
+
+{{
+  "results": [
+    {{
+      "name": "<the input exactly as given>",
+      "is_plant": true/false,
+      "plant_group": "Vegetables" | "Herbs" | "Fruit Trees" | "Flowering Shrubs" | "Perennial Flowers" | "Annual Flowers" | "Ornamental Trees" | "Houseplants" | "Succulents" | "Bulbs" | "Native Plants" | null
+    }}
+  ]
+}}
+
+Guidelines:
+- Set "is_plant" to true only if the input clearly refers to a living plant (houseplant, tree, shrub, flower, vegetable, herb, succulent, bulb, etc.).
+- If "is_plant" is false, set "plant_group" to null.
+- If "is_plant" is true, set "plant_group" to one of the following:
+  - "Vegetables": Annual edible plants grown for food (tomatoes, lettuce, peppers, carrots, etc.)
+  - "Herbs": Annual and perennial plants grown for culinary or medicinal use (basil, rosemary, mint, etc.)
+  - "Fruit Trees": Long-term fruit-producing trees and shrubs (apple, citrus, berry bushes, etc.)
+  - "Flowering Shrubs": Perennial woody ornamental plants (roses, hydrangeas, azaleas, etc.)
+  - "Perennial Flowers": Long-term flowering plants (hostas, daylilies, peonies, etc.)
+  - "Annual Flowers": Single-season flowering plants (marigolds, petunias, impatiens, etc.)
+  - "Ornamental Trees": Non-fruit bearing trees for landscaping (maples, oaks, dogwoods, etc.)
+  - "Houseplants": Plants typically grown indoors (fiddle leaf fig, pothos, etc.)
+  - "Succulents": Water-storing plants including cacti (echeveria, jade plants, aloe, etc.)
+  - "Bulbs": Underground storage organs with seasonal cycles (tulips, daffodils, gladiolus, etc.)
+  - "Native Plants": Plants indigenous to specific regions (varies by location)
+
+Inputs:
+{plant_names}
+Response:"""
@@ -1,14 +1,20 @@
 import base64
-import json
+import hashlib
 import logging
 from typing import Optional, Dict, Any
 
+import orjson
+
 from ..llm_base import make_llm_request, create_payload
+from ..ttl_cache import TTLCache
 from ...config import VISION_LLM_MODEL
 from .plant_identification_prompt import PLANT_IDENTIFICATION_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# Successful identifications keyed by the SHA-256 of the image bytes, so retried uploads skip the vision LLM
+_identification_cache = TTLCache(maxsize=512, ttl_seconds=24 * 60 * 60)
+
 def identify_plant_from_uploaded_image(image_data: bytes) -> Optional[Dict[str, Any]]:
     """
     Identify a plant from uploaded image data.
@@ -27,6 +33,12 @@ def identify_plant_from_uploaded_image(image_data: bytes) -> Optional[Dict[str,
         logger.error("Empty image data provided for plant identification")
         return None
     
+    image_key = hashlib.sha256(image_data).hexdigest()
+    cached_result = _identification_cache.get(image_key)
+    if cached_result is not None:
+        logger.info("Plant identification cache hit for image %s", image_key[:12])
+        return dict(cached_result)
+
     # Analyze the image using the LLM service
     identification_result = identify_plant_from_image(image_data)
     
@@ -34,7 +46,9 @@ def identify_plant_from_uploaded_image(image_data: bytes) -> Optional[Dict[str,
         logger.error("Failed to identify plant from image")
         return None
     
-    logger.info(f"Plant identification completed: is_plant={identification_result.get('is_plant')}, name={identification_result.get('common_name')}")
+    # Cache a copy so callers cannot mutate the stored result
+    _identification_cache.set(image_key, dict(identification_result))
+    logger.info("Plant identification completed: is_plant=%s, name=%s", identification_result.get('is_plant'), identification_result.get('common_name'))
     return identification_result
 
 def identify_plant_from_image(image_data: bytes) -> Optional[Dict[str, Any]]:
@@ -43,7 +57,7 @@ def identify_plant_from_image(image_data: bytes) -> Optional[Dict[str, Any]]:
     try:
         image_base64 = base64.b64encode(image_data).decode('utf-8')
     except Exception as e:
-        logger.error(f"Error encoding image to base64: {e}")
+        logger.error("Error encoding image to base64: %s", e)
         return None
 
     prompt = PLANT_IDENTIFICATION_PROMPT
@@ -93,22 +107,23 @@ def identify_plant_from_image(image_data: bytes) -> Optional[Dict[str, Any]]:
         "response_format": identification_schema,
     }
 
-    result = make_llm_request(payload)
+    # Results are cached by image hash above; skip the LLM cache so the base64 payload is not hashed again
+    result = make_llm_request(payload, use_cache=False)
     if not result:
         return None
 
     try:
-        identification = json.loads(result["content"])
+        identification = orjson.loads(result["content"])
         # Validate required fields
         if not all(k in identification for k in ['is_plant', 'message']):
-            logger.error(f"LLM JSON missing essential keys for plant identification: {identification}")
+            logger.error("LLM JSON missing essential keys for plant identification: %s", identification)
             return None
         
-        logger.info(f"Plant identification completed: is_plant={identification.get('is_plant')}, name={identification.get('common_name')}")
+        logger.info("Plant identification completed: is_plant=%s, name=%s", identification.get('is_plant'), identification.get('common_name'))
         return identification
-    except json.JSONDecodeError as json_e:
-        logger.error(f"Failed to decode JSON response from LLM for plant identification: {json_e}")
-        logger.error(f"LLM Raw Content: {result['content']}")
+    except orjson.JSONDecodeError as json_e:
+        logger.error("Failed to decode JSON response from LLM for plant identification: %s", json_e)
+        logger.error("LLM Raw Content: %s", result['content'])
         return None
 
 def validate_image_data(image_data: bytes, max_size_mb: int = 10) -> Dict[str, Any]:
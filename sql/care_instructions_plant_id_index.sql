@@ -0,0 +1,7 @@
+-- Index care_instructions by plant_id
+-- Postgres does not index foreign key columns automatically; upsert_plant_and_care deletes a
+-- plant's care instructions by plant_id on every write, which would otherwise scan the table.
+-- The plants lookup is already covered by the unique key in sql/unique_plant_keys.sql.
+
+create index if not exists care_instructions_plant_id_idx
+  on public.care_instructions (plant_id);
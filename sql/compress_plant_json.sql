@@ -0,0 +1,12 @@
+-- Store the large plants JSONB columns with LZ4 instead of the default pglz TOAST compression
+-- Requires Postgres 14+. Safe to apply at any time; it only changes how new values are compressed.
+-- Existing rows keep their current compression until they are rewritten (e.g. by the next upsert).
+--
+-- To check the compression used by stored values:
+--   select pg_column_compression(raw_llm_response), count(*) from public.plants group by 1;
+
+alter table public.plants
+  alter column raw_llm_response set compression lz4;
+
+alter table public.plants
+  alter column care_plan set compression lz4;
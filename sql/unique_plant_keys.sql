@@ -0,0 +1,16 @@
+-- Unique keys backing the ON CONFLICT upserts for plants and plant_images
+-- Apply before (re)creating upsert_plant_and_care in sql/upsert_plant_and_care.sql
+-- Requires Postgres 15+ for NULLS NOT DISTINCT, so houseplants/succulents (zone is null) are unique too.
+--
+-- Existing duplicates must be removed first. To find them:
+--   select plant_name, zone, plant_group, count(*) from public.plants
+--   group by 1, 2, 3 having count(*) > 1;
+--   select name, count(*) from public.plant_images group by 1 having count(*) > 1;
+
+alter table public.plants
+  add constraint plants_plant_name_zone_plant_group_key
+  unique nulls not distinct (plant_name, zone, plant_group);
+
+alter table public.plant_images
+  add constraint plant_images_name_key
+  unique (name);
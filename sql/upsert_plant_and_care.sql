@@ -2,6 +2,7 @@
 -- Create this in your Supabase database (SQL editor or migration)
 -- Assumes tables: plants(plant_id uuid pk default gen_random_uuid(), plant_name text, zone text, plant_group text, ...)
 -- and care_instructions(id uuid pk default gen_random_uuid(), plant_id uuid fk, care_phase text, months text, step_description text, priority text, order_within_season int)
+-- Requires the unique key from sql/unique_plant_keys.sql for ON CONFLICT
 
 create or replace function public.upsert_plant_and_care(
   plant jsonb,
@@ -14,92 +15,51 @@ security definer
 as $$
 declare
   v_plant_id uuid;
-  v_zone text := nullif(lookup->>'zone', '');
   v_group text := lookup->>'plant_group';
   v_name text := lookup->>'plant_name';
+  -- Houseplants and succulents are stored without a zone
+  v_zone text := case
+    when v_group in ('Houseplants', 'Succulents') then null
+    else nullif(lookup->>'zone', '')
+  end;
   v_record jsonb;
 begin
-  if v_group in ('Houseplants', 'Succulents') then
-    select plant_id into v_plant_id
-    from public.plants
-    where plant_name = v_name and plant_group = v_group and zone is null
-    limit 1;
+  -- Serialize writers for the same plant key so concurrent calls cannot interleave
+  -- the delete/insert of care instructions below; released at commit
+  perform pg_advisory_xact_lock(
+    hashtext('plant:' || coalesce(v_name, '') || ':' || coalesce(v_zone, '') || ':' || coalesce(v_group, ''))
+  );
 
-    if v_plant_id is null then
-      insert into public.plants (
-        plant_name, zone, description, type, sun_requirements,
-        seed_starting_month, planting_month, seed_starting_instructions,
-        planting_instructions, zone_suitability, seasonality, plant_group,
-        requirements, seed_starting, planting, care_plan,
-        model_used, raw_llm_response
-      ) values (
-        plant->>'plant_name', null, plant->>'description', plant->>'type', plant->>'sun_requirements',
-        plant->>'seed_starting_month', plant->>'planting_month', plant->'seed_starting_instructions',
-        plant->'planting_instructions', plant->>'zone_suitability', plant->>'seasonality', plant->>'plant_group',
-        plant->'requirements', plant->'seed_starting', plant->'planting', plant->'care_plan',
-        plant->>'model_used', plant->'raw_llm_response'
-      ) returning plant_id into v_plant_id;
-    else
-      update public.plants set
-        description = plant->>'description',
-        type = plant->>'type',
-        sun_requirements = plant->>'sun_requirements',
-        seed_starting_month = plant->>'seed_starting_month',
-        planting_month = plant->>'planting_month',
-        seed_starting_instructions = plant->'seed_starting_instructions',
-        planting_instructions = plant->'planting_instructions',
-        zone_suitability = plant->>'zone_suitability',
-        seasonality = plant->>'seasonality',
-        plant_group = plant->>'plant_group',
-        requirements = plant->'requirements',
-        seed_starting = plant->'seed_starting',
-        planting = plant->'planting',
-        care_plan = plant->'care_plan',
-        model_used = plant->>'model_used',
-        raw_llm_response = plant->'raw_llm_response'
-      where plant_id = v_plant_id;
-    end if;
-  else
-    select plant_id into v_plant_id
-    from public.plants
-    where plant_name = v_name and zone = v_zone
-    limit 1;
-
-    if v_plant_id is null then
-      insert into public.plants (
-        plant_name, zone, description, type, sun_requirements,
-        seed_starting_month, planting_month, seed_starting_instructions,
-        planting_instructions, zone_suitability, seasonality, plant_group,
-        requirements, seed_starting, planting, care_plan,
-        model_used, raw_llm_response
-      ) values (
-        plant->>'plant_name', v_zone, plant->>'description', plant->>'type', plant->>'sun_requirements',
-        plant->>'seed_starting_month', plant->>'planting_month', plant->'seed_starting_instructions',
-        plant->'planting_instructions', plant->>'zone_suitability', plant->>'seasonality', plant->>'plant_group',
-        plant->'requirements', plant->'seed_starting', plant->'planting', plant->'care_plan',
-        plant->>'model_used', plant->'raw_llm_response'
-      ) returning plant_id into v_plant_id;
-    else
-      update public.plants set
-        description = plant->>'description',
-        type = plant->>'type',
-        sun_requirements = plant->>'sun_requirements',
-        seed_starting_month = plant->>'seed_starting_month',
-        planting_month = plant->>'planting_month',
-        seed_starting_instructions = plant->'seed_starting_instructions',
-        planting_instructions = plant->'planting_instructions',
-        zone_suitability = plant->>'zone_suitability',
-        seasonality = plant->>'seasonality',
-        plant_group = plant->>'plant_group',
-        requirements = plant->'requirements',
-        seed_starting = plant->'seed_starting',
-        planting = plant->'planting',
-        care_plan = plant->'care_plan',
-        model_used = plant->>'model_used',
-        raw_llm_response = plant->'raw_llm_response'
-      where plant_id = v_plant_id;
-    end if;
-  end if;
+  insert into public.plants (
+    plant_name, zone, description, type, sun_requirements,
+    seed_starting_month, planting_month, seed_starting_instructions,
+    planting_instructions, zone_suitability, seasonality, plant_group,
+    requirements, seed_starting, planting, care_plan,
+    model_used, raw_llm_response
+  ) values (
+    v_name, v_zone, plant->>'description', plant->>'type', plant->>'sun_requirements',
+    plant->>'seed_starting_month', plant->>'planting_month', plant->'seed_starting_instructions',
+    plant->'planting_instructions', plant->>'zone_suitability', plant->>'seasonality', v_group,
+    plant->'requirements', plant->'seed_starting', plant->'planting', plant->'care_plan',
+    plant->>'model_used', plant->'raw_llm_response'
+  )
+  on conflict (plant_name, zone, plant_group) do update set
+    description = excluded.description,
+    type = excluded.type,
+    sun_requirements = excluded.sun_requirements,
+    seed_starting_month = excluded.seed_starting_month,
+    planting_month = excluded.planting_month,
+    seed_starting_instructions = excluded.seed_starting_instructions,
+    planting_instructions = excluded.planting_instructions,
+    zone_suitability = excluded.zone_suitability,
+    seasonality = excluded.seasonality,
+    requirements = excluded.requirements,
+    seed_starting = excluded.seed_starting,
+    planting = excluded.planting,
+    care_plan = excluded.care_plan,
+    model_used = excluded.model_used,
+    raw_llm_response = excluded.raw_llm_response
+  returning plant_id into v_plant_id;
 
   -- Replace care instructions
   delete from public.care_instructions where plant_id = v_plant_id;
@@ -0,0 +1,33 @@
+-- Postgres function to upsert many plants and their care instructions in one transaction
+-- Create this after sql/upsert_plant_and_care.sql; each payload has the same shape as that
+-- function's arguments: {"plant": {...}, "care_instructions": [...], "lookup": {...}}
+-- Returns {"stored": <number of payloads applied>}
+
+create or replace function public.upsert_plants_bulk(
+  payloads jsonb
+)
+returns jsonb
+language plpgsql
+security definer
+as $$
+declare
+  r jsonb;
+  v_count int := 0;
+begin
+  -- Apply payloads in key order so concurrent batches take the per-plant
+  -- advisory locks in the same order and cannot deadlock each other
+  for r in
+    select p
+    from jsonb_array_elements(coalesce(payloads, '[]'::jsonb)) as p
+    order by p->'lookup'->>'plant_name', p->'lookup'->>'zone', p->'lookup'->>'plant_group'
+  loop
+    perform public.upsert_plant_and_care(r->'plant', r->'care_instructions', r->'lookup');
+    v_count := v_count + 1;
+  end loop;
+
+  return jsonb_build_object('stored', v_count);
+end;
+$$;
+
+-- Optional: grant execute to anon/service roles
+-- grant execute on function public.upsert_plants_bulk(jsonb) to anon, service_role;